@@ -6,26 +6,32 @@ Utilities for syncing data between local CSVs, Supabase, and local GeoPackages.
 Subcommands:
     reindex   Upload solris_lookup.csv and water_filtration_lookup.csv to Supabase.
               Run this after editing either CSV to keep Supabase in sync.
+              Tables whose CSV and Supabase contents are unchanged since
+              the last reindex are skipped; pass --force to drop and
+              re-upload them anyway.
 
     export    Pull a Supabase table to a local GeoPackage via ogr2ogr.
 
 Usage:
     python database_helpers.py reindex
     python database_helpers.py reindex --solris-csv data/solris_lookup.csv --water-csv data/water_filtration_lookup.csv
+    python database_helpers.py reindex --force
 
     python database_helpers.py export --table dzcib_projects_solris
     python database_helpers.py export --table dzcib_projects_solris --output GIS/projects.gpkg
 """
 
 import argparse
+import hashlib
 import os
 import subprocess
 import sys
 
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import BigInteger, Integer, Text, inspect, text
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 
-from lookup_support import supabase_engine
+from lookup_support import psql_copy, read_only_connection, supabase_engine
 from runtime_support import ensure_parent_dir, load_project_dotenv, resolve_repo_path
 
 load_project_dotenv()
@@ -39,6 +45,47 @@ SOLRIS_REQUIRED_COLUMNS = [
 
 WATER_REQUIRED_COLUMNS = ["wetland_type", "value"]
 
+# Records, per uploaded lookup table, the hash of the CSV it came from and a
+# fingerprint of its contents, so reindex can skip tables that are in sync.
+LOOKUP_META_TABLE = "lookup_meta"
+
+# Explicit parse dtypes so the CSV parser skips type inference. Per-hectare
+# factors stay float64 to keep the uploaded values exact. The water
+# filtration values are left to inference: they are whole dollars today and
+# existing tables were created with an integer column for them.
+SOLRIS_DTYPES = {
+    "solris_code": "Int32",
+    "biocapacity_conversion_factor": "float64",
+    "agc_tc_ha": "float64",
+    "bgc_tc_ha": "float64",
+    "soc_tc_ha": "float64",
+    "deoc_tc_ha": "float64",
+    "naturalness": "float64",
+}
+
+# Column types each lookup table is created with. Reindex truncates an
+# existing table only when its reflected columns match these exactly.
+# wf_value_per_ha stays BIGINT, the type earlier reindexes created it with.
+LOOKUP_SQL_TYPES = {
+    "solris_lookup": {
+        "solris_code": Integer(),
+        "solris_class": Text(),
+        "biocapacity_category": Text(),
+        "biocapacity_conversion_factor": DOUBLE_PRECISION(),
+        "lulc_category": Text(),
+        "agc_tc_ha": DOUBLE_PRECISION(),
+        "bgc_tc_ha": DOUBLE_PRECISION(),
+        "soc_tc_ha": DOUBLE_PRECISION(),
+        "deoc_tc_ha": DOUBLE_PRECISION(),
+        "naturalness": DOUBLE_PRECISION(),
+        "description": Text(),
+    },
+    "water_filtration_lookup": {
+        "solris_class": Text(),
+        "wf_value_per_ha": BigInteger(),
+    },
+}
+
 
 # ── Shared helpers ─────────────────────────────────────────────────────────────
 
@@ -49,49 +96,187 @@ def _supabase_engine():
         sys.exit(f"Error: {exc}")
 
 
-def _drop_and_upload(engine, table_name: str, df: pd.DataFrame) -> None:
-    """Cascade drop table if it exists, then upload df as a fresh table."""
+def _file_token(path) -> str:
+    """Content hash of a source CSV, recorded for its table in LOOKUP_META_TABLE."""
+    return "sha1:" + hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def _table_fingerprint(conn, table_name: str) -> tuple[int, str]:
+    """Row count and md5 of a table's rows, independent of physical order."""
+    quoted = conn.dialect.identifier_preparer.quote_identifier(table_name)
+    row = conn.execute(
+        text(
+            "SELECT count(*), "
+            "md5(coalesce(string_agg(t::text, E'\\n' ORDER BY t::text), '')) "
+            f"FROM {quoted} AS t"
+        )
+    ).one()
+    return row[0], row[1]
+
+
+def _unchanged_tables(engine, tokens: dict[str, str]) -> set[str]:
+    """Tables whose source CSV and contents both match the last reindex."""
+    with read_only_connection(engine) as conn:
+        inspector = inspect(conn)
+        if not inspector.has_table(LOOKUP_META_TABLE):
+            return set()
+        rows = conn.execute(
+            text(
+                "SELECT table_name, source_token, row_count, content_md5 "
+                f"FROM {LOOKUP_META_TABLE} WHERE table_name = ANY(:names)"
+            ),
+            {"names": list(tokens)},
+        ).all()
+        return {
+            name
+            for name, source_token, row_count, content_md5 in rows
+            if source_token == tokens[name]
+            and inspector.has_table(name)
+            and _table_fingerprint(conn, name) == (row_count, content_md5)
+        }
+
+
+def _referenced_tables(conn, table_names: list[str]) -> set[str]:
+    """Tables among table_names that another table's foreign key points at."""
+    rows = conn.execute(
+        text(
+            "SELECT DISTINCT name FROM unnest(CAST(:names AS text[])) AS name "
+            "JOIN pg_constraint c ON c.confrelid = to_regclass(quote_ident(name)) "
+            "WHERE c.contype = 'f'"
+        ),
+        {"names": table_names},
+    )
+    return set(rows.scalars())
+
+
+def _replace_tables(
+    engine,
+    tables: dict[str, pd.DataFrame],
+    tokens: dict[str, str] | None = None,
+    recreate: bool = False,
+) -> None:
+    """Replace the contents of each table with its df.
+
+    Tables whose columns already match their LOOKUP_SQL_TYPES entry are
+    truncated in one statement, keeping their schema and dependent objects.
+    Any others, any that another table's foreign key references (TRUNCATE
+    would refuse them), or all of them with `recreate`, are cascade dropped
+    in one statement and recreated by to_sql with those types. Each table's
+    entry in `tokens` is then recorded in LOOKUP_META_TABLE along with the
+    uploaded contents' fingerprint. Runs on one connection in one
+    transaction, so a failed upload leaves the previous tables in place.
+    """
+    quote = engine.dialect.identifier_preparer.quote_identifier
     with engine.begin() as conn:
-        conn.execute(text(f'DROP TABLE IF EXISTS "{table_name}" CASCADE'))
-    df.to_sql(table_name, engine, if_exists="append", index=False)
+        inspector = inspect(conn)
+        existing = set(inspector.get_table_names())
+        referenced = _referenced_tables(conn, list(tables))
+        to_truncate, to_drop = [], []
+        for table_name, df in tables.items():
+            if table_name not in existing:
+                continue
+            sql_types = LOOKUP_SQL_TYPES.get(table_name, {})
+            expected = {
+                name: sql_types[name].compile(dialect=conn.dialect)
+                for name in df.columns if name in sql_types
+            }
+            columns = {
+                col["name"]: col["type"].compile(dialect=conn.dialect)
+                for col in inspector.get_columns(table_name)
+            }
+            if not recreate and table_name not in referenced and columns == expected:
+                to_truncate.append(quote(table_name))
+            else:
+                to_drop.append(quote(table_name))
+
+        if to_truncate:
+            conn.execute(text(f"TRUNCATE {', '.join(to_truncate)}"))
+        if to_drop:
+            conn.execute(text(f"DROP TABLE IF EXISTS {', '.join(to_drop)} CASCADE"))
+        for table_name, df in tables.items():
+            df.to_sql(
+                table_name, conn, if_exists="append", index=False,
+                dtype=LOOKUP_SQL_TYPES.get(table_name), method=psql_copy,
+                chunksize=50_000,
+            )
+
+        if tokens:
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {LOOKUP_META_TABLE} ("
+                "table_name text PRIMARY KEY, source_token text NOT NULL, "
+                "row_count bigint NOT NULL, content_md5 text NOT NULL, "
+                "updated_at timestamptz NOT NULL DEFAULT now())"
+            ))
+            for table_name in tables.keys() & tokens.keys():
+                row_count, content_md5 = _table_fingerprint(conn, table_name)
+                conn.execute(
+                    text(
+                        f"INSERT INTO {LOOKUP_META_TABLE} "
+                        "(table_name, source_token, row_count, content_md5) "
+                        "VALUES (:name, :token, :row_count, :content_md5) "
+                        "ON CONFLICT (table_name) DO UPDATE SET "
+                        "source_token = EXCLUDED.source_token, "
+                        "row_count = EXCLUDED.row_count, "
+                        "content_md5 = EXCLUDED.content_md5, "
+                        "updated_at = now()"
+                    ),
+                    {
+                        "name": table_name,
+                        "token": tokens[table_name],
+                        "row_count": row_count,
+                        "content_md5": content_md5,
+                    },
+                )
 
 
 # ── reindex ────────────────────────────────────────────────────────────────────
 
-def upload_solris_lookup(csv_path: str) -> None:
-    csv_path = resolve_repo_path(csv_path)
-    df = pd.read_csv(csv_path)
-    missing = [c for c in SOLRIS_REQUIRED_COLUMNS if c not in df.columns]
+def read_solris_lookup(csv_path) -> pd.DataFrame:
+    columns = pd.read_csv(csv_path, nrows=0).columns
+    missing = [c for c in SOLRIS_REQUIRED_COLUMNS if c not in columns]
     if missing:
         sys.exit(f"Error: solris CSV is missing columns: {missing}")
-    df = df.dropna(subset=["solris_code"])
-    engine = _supabase_engine()
     try:
-        _drop_and_upload(engine, "solris_lookup", df)
-        print(f"  solris_lookup: {len(df)} rows uploaded from '{csv_path}'")
-    finally:
-        engine.dispose()
+        df = pd.read_csv(csv_path, dtype=SOLRIS_DTYPES)
+    except (TypeError, ValueError) as exc:
+        sys.exit(f"Error: solris CSV has a malformed value: {exc}")
+    return df.dropna(subset=["solris_code"])
 
 
-def upload_water_filtration_lookup(csv_path: str) -> None:
-    csv_path = resolve_repo_path(csv_path)
+def read_water_filtration_lookup(csv_path) -> pd.DataFrame:
     df = pd.read_csv(csv_path)
     missing = [c for c in WATER_REQUIRED_COLUMNS if c not in df.columns]
     if missing:
         sys.exit(f"Error: water filtration CSV is missing columns: {missing}")
-    df = df.rename(columns={"wetland_type": "solris_class", "value": "wf_value_per_ha"})
-    engine = _supabase_engine()
-    try:
-        _drop_and_upload(engine, "water_filtration_lookup", df)
-        print(f"  water_filtration_lookup: {len(df)} rows uploaded from '{csv_path}'")
-    finally:
-        engine.dispose()
+    return df.rename(columns={"wetland_type": "solris_class", "value": "wf_value_per_ha"})
 
 
 def cmd_reindex(args):
     print("Uploading lookup tables to Supabase...")
-    upload_solris_lookup(args.solris_csv)
-    upload_water_filtration_lookup(args.water_csv)
+    sources = {
+        "solris_lookup": (resolve_repo_path(args.solris_csv), read_solris_lookup),
+        "water_filtration_lookup": (
+            resolve_repo_path(args.water_csv), read_water_filtration_lookup,
+        ),
+    }
+    engine = _supabase_engine()
+
+    tokens = {name: _file_token(csv_path) for name, (csv_path, _) in sources.items()}
+    unchanged = set() if args.force else _unchanged_tables(engine, tokens)
+
+    tables = {
+        name: read_csv(csv_path)
+        for name, (csv_path, read_csv) in sources.items()
+        if name not in unchanged
+    }
+    if tables:
+        _replace_tables(engine, tables, tokens, recreate=args.force)
+
+    for name, (csv_path, _) in sources.items():
+        if name in tables:
+            print(f"  {name}: {len(tables[name])} rows uploaded from '{csv_path}'")
+        else:
+            print(f"  {name}: '{csv_path}' and table unchanged since last reindex, skipped")
     print("Done.")
 
 
@@ -149,6 +334,11 @@ def main():
         default="data/water_filtration_lookup.csv",
         help="Water filtration lookup CSV  [default: %(default)s]",
     )
+    p_reindex.add_argument(
+        "--force",
+        action="store_true",
+        help="Drop and re-upload tables even if they are unchanged since the last reindex.",
+    )
 
     # export subcommand
     p_export = sub.add_parser(
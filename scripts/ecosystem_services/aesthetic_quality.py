@@ -1,14 +1,26 @@
 import bisect
+import numpy as np
 import pandas as pd
 import logging
 
 logger = logging.getLogger(__name__)
 
+_REPORT_HEADER = (
+    "\n        AESTHETIC QUALITY ANALYSIS REPORT\n"
+    "        Study Area: {study_area_name}\n"
+    "        Generated: {generated}\n\n"
+    f"        {'=' * 60}\n        SUMMARY BY SOLRIS CLASS\n        {'=' * 60}\n\n"
+)
+_REPORT_FOOTER = (
+    f"        {'=' * 60}\n        TOTALS\n        {'=' * 60}\n"
+    "        Total Area: {total_area:,.2f} hectares\n"
+    "        Area-Weighted Average Aesthetic Score: {weighted_avg:.2f}\n"
+)
+
 _NATURALNESS_WEIGHT = 0.67
 _RARITY_WEIGHT = 0.33
 
 # Rarity bins: percentage-of-total area → score (5 = rarest, 1 = most common)
-_RARITY_BINS        = [-float("inf"), 1, 5, 15, 30, float("inf")]
 _RARITY_LABELS      = [5, 4, 3, 2, 1]
 _RARITY_BREAKPOINTS = [1, 5, 15, 30]
 
@@ -21,9 +33,18 @@ def _pct_to_rarity(pct: float) -> int:
 _no_context_warned = False
 
 
-def _rarity_from_areas(code: int, areas: dict) -> int:
-    """Return the rarity score for a SOLRIS code given a {code: area_ha} landscape dict."""
-    total = sum(v for v in areas.values() if v > 0)
+def _rarity_total(areas: dict) -> float:
+    """Total landscape area that rarity percentages are taken against."""
+    return sum(v for v in areas.values() if v > 0)
+
+
+def _rarity_from_areas(code: int, areas: dict, total: float | None = None) -> int:
+    """Return the rarity score for a SOLRIS code given a {code: area_ha} landscape dict.
+
+    Pass `total` (from _rarity_total) when scoring several codes of one landscape.
+    """
+    if total is None:
+        total = _rarity_total(areas)
     if total == 0:
         return 1
     return _pct_to_rarity(areas.get(code, 0.0) / total * 100)
@@ -61,10 +82,11 @@ def landscape_aq(lookup: dict, context_areas: dict) -> float:
     total_area = sum(context_areas.values())
     if total_area == 0:
         return 0.0
+    rarity_total = _rarity_total(context_areas)
     weighted_sum = 0.0
     for code, area_ha in context_areas.items():
         naturalness = lookup.get(code, {}).get("naturalness", 0.0)
-        rarity = _rarity_from_areas(code, context_areas)
+        rarity = _rarity_from_areas(code, context_areas, rarity_total)
         weighted_sum += (naturalness * _NATURALNESS_WEIGHT + rarity * _RARITY_WEIGHT) * area_ha
     return weighted_sum / total_area
 
@@ -121,12 +143,11 @@ class AestheticQualityProcessor:
         merged["percentage_of_total"] = merged["area_hectares"] / total_study_area * 100
 
         # Rarity: binned by how rare each class is as a share of the total area
-        merged["rarity_score"] = pd.cut(
-            merged["percentage_of_total"],
-            bins=_RARITY_BINS,
-            labels=_RARITY_LABELS,
-            right=True,
-        ).astype(int)
+        # (right-closed bins, so exactly 1% still scores 5)
+        bin_idx = np.searchsorted(
+            _RARITY_BREAKPOINTS, merged["percentage_of_total"].to_numpy(), side="left"
+        )
+        merged["rarity_score"] = np.asarray(_RARITY_LABELS)[bin_idx]
 
         merged["aesthetic_quality_score"] = (
             merged["naturalness_score"] * _NATURALNESS_WEIGHT
@@ -143,34 +164,29 @@ class AestheticQualityProcessor:
         )
 
         total_area = results_df["area_hectares"].sum()
-        weighted_avg = (
-            (results_df["aesthetic_quality_score"] * results_df["area_hectares"]).sum()
-            / total_area
-            if total_area > 0
-            else 0
-        )
+        # nan_to_num keeps Series.sum()'s skip-NaN behaviour for unscored classes
+        scores = np.nan_to_num(results_df["aesthetic_quality_score"].to_numpy(dtype=float))
+        areas = results_df["area_hectares"].to_numpy(dtype=float)
+        weighted_avg = float(scores @ areas) / total_area if total_area > 0 else 0
 
-        report = (
-            f"\n        AESTHETIC QUALITY ANALYSIS REPORT\n"
-            f"        Study Area: {study_area_name}\n"
-            f"        Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            f"        {'='*60}\n        SUMMARY BY SOLRIS CLASS\n        {'='*60}\n\n"
+        results_df["area_pct"] = (
+            results_df["area_hectares"] / total_area * 100 if total_area > 0 else 0
         )
 
-        for _, row in results_df.iterrows():
-            area_pct = (row["area_hectares"] / total_area * 100) if total_area > 0 else 0
-            report += (
-                f"        {row['solris_class']}:\n"
-                f"        Aesthetic Score: {row['aesthetic_quality_score']:.2f}\n"
-                f"          - Area: {row['area_hectares']:,.2f} hectares ({area_pct:.1f}% of total)\n"
-                f"          - Naturalness Score: {row['naturalness_score']:.2f}\n"
-                f"          - Rarity Score: {row['rarity_score']} (5=rarest, 1=most common)\n\n"
+        parts = [_REPORT_HEADER.format(
+            study_area_name=study_area_name,
+            generated=pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )]
+
+        for row in results_df.itertuples(index=False):
+            parts.append(
+                f"        {row.solris_class}:\n"
+                f"        Aesthetic Score: {row.aesthetic_quality_score:.2f}\n"
+                f"          - Area: {row.area_hectares:,.2f} hectares ({row.area_pct:.1f}% of total)\n"
+                f"          - Naturalness Score: {row.naturalness_score:.2f}\n"
+                f"          - Rarity Score: {row.rarity_score} (5=rarest, 1=most common)\n\n"
             )
 
-        report += (
-            f"        {'='*60}\n        TOTALS\n        {'='*60}\n"
-            f"        Total Area: {total_area:,.2f} hectares\n"
-            f"        Area-Weighted Average Aesthetic Score: {weighted_avg:.2f}\n"
-        )
+        parts.append(_REPORT_FOOTER.format(total_area=total_area, weighted_avg=weighted_avg))
 
-        return report
+        return "".join(parts)
@@ -1,8 +1,22 @@
+import numpy as np
 import pandas as pd
 import logging
 
 logger = logging.getLogger(__name__)
 
+_REPORT_HEADER = (
+    "\n        BIOCAPACITY ANALYSIS REPORT\n"
+    "        Study Area: {study_area_name}\n"
+    "        Generated: {generated}\n\n"
+    f"        {'=' * 50}\n        SUMMARY BY SOLRIS CLASS\n        {'=' * 50}\n\n"
+)
+_REPORT_FOOTER = (
+    f"        {'=' * 50}\n        TOTALS\n        {'=' * 50}\n"
+    "        Total Area: {total_area:,.2f} hectares\n"
+    "        Total Biocapacity: {total_biocapacity:,.2f} global hectares\n"
+    "        Biocapacity per Hectare: {biocapacity_per_ha:.3f} gha/ha\n"
+)
+
 
 class BiocapacityProcessor:
     FOLDER_NAME = "biocapacity"
@@ -29,14 +43,16 @@ class BiocapacityProcessor:
         if len(missing_codes) > 0:
             logger.warning(f"Missing lookup entries for SOLRIS codes: {missing_codes}")
 
-        merged["biocapacity_gha"] = (
-            merged["area_hectares"] * merged["biocapacity_conversion_factor"]
+        biocapacity = (
+            merged["area_hectares"].to_numpy(dtype=float)
+            * merged["biocapacity_conversion_factor"].to_numpy(dtype=float)
         )
+        merged["biocapacity_gha"] = biocapacity
 
-        total_biocapacity = merged["biocapacity_gha"].sum()
+        # nansum: codes missing from the lookup have no factor and are skipped
+        total_biocapacity = np.nansum(biocapacity)
         merged["biocapacity_pct"] = (
-            merged["biocapacity_gha"] / total_biocapacity * 100
-            if total_biocapacity != 0 else 0
+            biocapacity * (100.0 / total_biocapacity) if total_biocapacity != 0 else 0
         )
 
         return merged
@@ -55,27 +71,25 @@ class BiocapacityProcessor:
             results_df["total_biocapacity_gha"] / total_biocapacity * 100
         )
 
-        report = (
-            f"\n        BIOCAPACITY ANALYSIS REPORT\n"
-            f"        Study Area: {study_area_name}\n"
-            f"        Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            f"        {'='*50}\n        SUMMARY BY SOLRIS CLASS\n        {'='*50}\n\n"
+        report = _REPORT_HEADER.format(
+            study_area_name=study_area_name,
+            generated=pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
         )
 
-        for _, row in results_df.iterrows():
-            report += (
-                f"        {row['solris_class']}:\n"
-                f"        Area: {row['total_area_hectares']:,.2f} hectares "
-                f"({row['total_area_hectares']/total_area*100:.1f}% of total)\n"
-                f"        Biocapacity: {row['total_biocapacity_gha']:,.2f} global hectares "
-                f"({row['biocapacity_pct']:.1f}% of total)\n\n"
-            )
-
+        area_pct = results_df["total_area_hectares"] / total_area * 100
         report += (
-            f"        {'='*50}\n        TOTALS\n        {'='*50}\n"
-            f"        Total Area: {total_area:,.2f} hectares\n"
-            f"        Total Biocapacity: {total_biocapacity:,.2f} global hectares\n"
-            f"        Biocapacity per Hectare: {total_biocapacity/total_area:.3f} gha/ha\n"
+            "        " + results_df["solris_class"].astype(str) + ":\n"
+            + "        Area: " + results_df["total_area_hectares"].map("{:,.2f}".format)
+            + " hectares (" + area_pct.map("{:.1f}".format) + "% of total)\n"
+            + "        Biocapacity: " + results_df["total_biocapacity_gha"].map("{:,.2f}".format)
+            + " global hectares (" + results_df["biocapacity_pct"].map("{:.1f}".format)
+            + "% of total)\n\n"
+        ).str.cat()
+
+        report += _REPORT_FOOTER.format(
+            total_area=total_area,
+            total_biocapacity=total_biocapacity,
+            biocapacity_per_ha=total_biocapacity / total_area,
         )
 
         return report
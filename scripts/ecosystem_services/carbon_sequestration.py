@@ -1,9 +1,25 @@
+import numpy as np
 import pandas as pd
 import logging
 
 logger = logging.getLogger(__name__)
 
+_REPORT_HEADER = (
+    "\n        CARBON SEQUESTRATION ANALYSIS REPORT\n"
+    "        Study Area: {study_area_name}\n"
+    "        Generated: {generated}\n\n"
+    f"        {'=' * 60}\n        SUMMARY BY SOLRIS CLASS\n        {'=' * 60}\n\n"
+)
+_REPORT_FOOTER = (
+    f"        {'=' * 60}\n        TOTALS\n        {'=' * 60}\n"
+    "        Total Area: {total_area:,.2f} hectares\n"
+    "        Total Carbon Sequestration: {total_carbon:,.2f} tonnes C\n"
+    "        Average Carbon Density: {carbon_density:.2f} tC/ha\n"
+    "        Total SSC: ${total_ssc:,.2f} million CAD\n"
+)
+
 _SCC_BASE_YEAR_VALUE = 252  # $/tC in 2021
+_CARBON_POOLS = ["agc_tc_ha", "bgc_tc_ha", "soc_tc_ha", "deoc_tc_ha"]
 
 
 class CarbonSequestrationProcessor:
@@ -24,7 +40,7 @@ class CarbonSequestrationProcessor:
         return {"change_carbon_tc": change_c, "change_ssc_cad": change_c * _SCC_BASE_YEAR_VALUE}
 
     def process(self, area_df, solris_df, wf_df=None):
-        cols = ["solris_code", "solris_class", "agc_tc_ha", "bgc_tc_ha", "soc_tc_ha", "deoc_tc_ha"]
+        cols = ["solris_code", "solris_class"] + _CARBON_POOLS
         lookup_df = solris_df[[c for c in cols if c in solris_df.columns]]
         merged = area_df.merge(lookup_df, on="solris_code", how="left")
 
@@ -32,12 +48,9 @@ class CarbonSequestrationProcessor:
         if len(missing_codes) > 0:
             logger.warning(f"Missing lookup entries for SOLRIS codes: {missing_codes}")
 
-        merged["total_carbon_tc"] = (
-            merged["agc_tc_ha"].fillna(0)
-            + merged["bgc_tc_ha"].fillna(0)
-            + merged["soc_tc_ha"].fillna(0)
-            + merged["deoc_tc_ha"].fillna(0)
-        ) * merged["area_hectares"]
+        # Row-wise nansum over the pools counts missing values as 0 in one pass
+        carbon_per_ha = np.nansum(merged[_CARBON_POOLS].to_numpy(dtype=float), axis=1)
+        merged["total_carbon_tc"] = carbon_per_ha * merged["area_hectares"].to_numpy(dtype=float)
 
         merged["ssc"] = merged["total_carbon_tc"] * _SCC_BASE_YEAR_VALUE
         merged["ssc_million_cad"] = (merged["ssc"] / 1_000_000).round(4)
@@ -50,7 +63,10 @@ class CarbonSequestrationProcessor:
         return merged
 
     def generate_report(self, study_area_name, results_df):
-        df = results_df.copy()
+        df = results_df[
+            ["solris_class", "area_hectares", "total_carbon_tc", "ssc_million_cad"]
+            + _CARBON_POOLS
+        ].copy()
         df["ssc_density"] = (df["ssc_million_cad"] / df["area_hectares"]).replace(
             [float("inf"), -float("inf")], 0
         ).fillna(0)
@@ -68,41 +84,41 @@ class CarbonSequestrationProcessor:
             .sort_values("total_carbon_tc", ascending=False)
         )
 
-        total_carbon = agg["total_carbon_tc"].sum()
-        total_area   = agg["total_area_hectares"].sum()
-        total_ssc    = agg["total_ssc"].sum()
-        agg["carbon_pct"] = agg["total_carbon_tc"] / total_carbon * 100
-
-        report = (
-            f"\n        CARBON SEQUESTRATION ANALYSIS REPORT\n"
-            f"        Study Area: {study_area_name}\n"
-            f"        Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            f"        {'='*60}\n        SUMMARY BY SOLRIS CLASS\n        {'='*60}\n\n"
+        total_carbon, total_area, total_ssc = (
+            agg[["total_carbon_tc", "total_area_hectares", "total_ssc"]].sum().to_numpy()
         )
-
-        for _, row in agg.iterrows():
-            report += (
-                f"        {row['solris_class']}:\n"
-                f"        Area: {row['total_area_hectares']:,.2f} hectares "
-                f"({row['total_area_hectares']/total_area*100:.1f}% of total)\n"
-                f"        Total Carbon: {row['total_carbon_tc']:,.2f} tonnes C "
-                f"({row['carbon_pct']:.1f}% of total)\n"
-                f"        Carbon Density: {row['total_carbon_tc']/row['total_area_hectares']:.2f} tC/ha\n"
+        agg["carbon_pct"] = agg["total_carbon_tc"] / total_carbon * 100
+        agg["area_pct"] = agg["total_area_hectares"] / total_area * 100
+        agg["carbon_density"] = agg["total_carbon_tc"] / agg["total_area_hectares"]
+        agg["ssc_per_ha"] = 1_000_000 * agg["total_ssc_density"]
+
+        parts = [_REPORT_HEADER.format(
+            study_area_name=study_area_name,
+            generated=pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )]
+
+        for row in agg.itertuples(index=False):
+            parts.append(
+                f"        {row.solris_class}:\n"
+                f"        Area: {row.total_area_hectares:,.2f} hectares "
+                f"({row.area_pct:.1f}% of total)\n"
+                f"        Total Carbon: {row.total_carbon_tc:,.2f} tonnes C "
+                f"({row.carbon_pct:.1f}% of total)\n"
+                f"        Carbon Density: {row.carbon_density:.2f} tC/ha\n"
                 f"        Breakdown per hectare:\n"
-                f"          - AGC:  {row['avg_agc_tc_ha']:.2f} tC/ha\n"
-                f"          - BGC:  {row['avg_bgc_tc_ha']:.2f} tC/ha\n"
-                f"          - SOC:  {row['avg_soc_tc_ha']:.2f} tC/ha\n"
-                f"          - DeOC: {row['avg_deoc_tc_ha']:.2f} tC/ha\n"
-                f"          - SSC:  ${1_000_000 * row['total_ssc_density']:.2f} $CAD/ha\n"
-                f"        Total SSC: ${row['total_ssc']:,.6f} million CAD\n\n"
+                f"          - AGC:  {row.avg_agc_tc_ha:.2f} tC/ha\n"
+                f"          - BGC:  {row.avg_bgc_tc_ha:.2f} tC/ha\n"
+                f"          - SOC:  {row.avg_soc_tc_ha:.2f} tC/ha\n"
+                f"          - DeOC: {row.avg_deoc_tc_ha:.2f} tC/ha\n"
+                f"          - SSC:  ${row.ssc_per_ha:.2f} $CAD/ha\n"
+                f"        Total SSC: ${row.total_ssc:,.6f} million CAD\n\n"
             )
 
-        report += (
-            f"        {'='*60}\n        TOTALS\n        {'='*60}\n"
-            f"        Total Area: {total_area:,.2f} hectares\n"
-            f"        Total Carbon Sequestration: {total_carbon:,.2f} tonnes C\n"
-            f"        Average Carbon Density: {total_carbon/total_area:.2f} tC/ha\n"
-            f"        Total SSC: ${total_ssc:,.2f} million CAD\n"
-        )
+        parts.append(_REPORT_FOOTER.format(
+            total_area=total_area,
+            total_carbon=total_carbon,
+            carbon_density=total_carbon / total_area,
+            total_ssc=total_ssc,
+        ))
 
-        return report
+        return "".join(parts)
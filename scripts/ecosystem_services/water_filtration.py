@@ -3,6 +3,18 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_REPORT_HEADER = (
+    "\n        WATER FILTRATION ANALYSIS REPORT\n"
+    "        Study Area: {study_area_name}\n"
+    "        Generated: {generated}\n\n"
+    f"        {'=' * 60}\n        SUMMARY BY SOLRIS CLASS\n        {'=' * 60}\n\n"
+)
+_REPORT_FOOTER = (
+    f"        {'=' * 60}\n        TOTALS\n        {'=' * 60}\n"
+    "        Total Area: {total_area:,.2f} hectares\n"
+    "        Total Water Filtration Value ($ millions CAD): {total_wf_millions:,.6f}\n"
+)
+
 
 class WaterFiltrationProcessor:
     FOLDER_NAME = "water_filtration"
@@ -22,14 +34,15 @@ class WaterFiltrationProcessor:
         }
 
     def process(self, area_df, solris_df, wf_df=None):
-        merged = area_df.merge(
-            solris_df[["solris_code", "solris_class"]], on="solris_code", how="left"
-        )
-
+        lookup_df = solris_df[["solris_code", "solris_class"]]
         if wf_df is not None:
+            # Resolve values onto SOLRIS codes within the small lookup, so the
+            # area data is joined once on the integer code, not on class text.
             wf = wf_df[["solris_class", "wf_value_per_ha"]]
-            merged = merged.merge(wf, on="solris_class", how="left")
-        else:
+            lookup_df = lookup_df.merge(wf, on="solris_class", how="left")
+
+        merged = area_df.merge(lookup_df, on="solris_code", how="left")
+        if wf_df is None:
             merged["wf_value_per_ha"] = 0.0
 
         merged["wf_value_per_ha"] = merged["wf_value_per_ha"].fillna(0)
@@ -55,28 +68,22 @@ class WaterFiltrationProcessor:
 
         total_area = agg["total_area_hectares"].sum() if not agg.empty else 0
         total_wf   = agg["total_wf_value"].sum()      if not agg.empty else 0
+        agg["pct_area"] = agg["total_area_hectares"] / total_area * 100 if total_area else 0
+        agg["pct_wf"]   = agg["total_wf_value"]      / total_wf   * 100 if total_wf   else 0
 
-        report = (
-            f"\n        WATER FILTRATION ANALYSIS REPORT\n"
-            f"        Study Area: {study_area_name}\n"
-            f"        Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            f"        {'='*60}\n        SUMMARY BY SOLRIS CLASS\n        {'='*60}\n\n"
-        )
+        parts = [_REPORT_HEADER.format(
+            study_area_name=study_area_name,
+            generated=pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S"),
+        )]
 
-        for _, row in agg.iterrows():
-            pct_area = (row["total_area_hectares"] / total_area * 100) if total_area else 0
-            pct_wf   = (row["total_wf_value"]      / total_wf   * 100) if total_wf   else 0
-            report += (
-                f"        {row['solris_class']}:\n"
-                f"        Area: {row['total_area_hectares']:,.2f} hectares ({pct_area:.1f}% of total)\n"
-                f"        WF Value($)/ha: {row['wf_value_per_ha']:,.2f}\n"
-                f"        Total WF Value($): {row['total_wf_value']:,.2f} ({pct_wf:.1f}% of total)\n\n"
+        for row in agg.itertuples(index=False):
+            parts.append(
+                f"        {row.solris_class}:\n"
+                f"        Area: {row.total_area_hectares:,.2f} hectares ({row.pct_area:.1f}% of total)\n"
+                f"        WF Value($)/ha: {row.wf_value_per_ha:,.2f}\n"
+                f"        Total WF Value($): {row.total_wf_value:,.2f} ({row.pct_wf:.1f}% of total)\n\n"
             )
 
-        report += (
-            f"        {'='*60}\n        TOTALS\n        {'='*60}\n"
-            f"        Total Area: {total_area:,.2f} hectares\n"
-            f"        Total Water Filtration Value ($ millions CAD): {total_wf/1e6:,.6f}\n"
-        )
+        parts.append(_REPORT_FOOTER.format(total_area=total_area, total_wf_millions=total_wf / 1e6))
 
-        return report
+        return "".join(parts)
@@ -1,3 +1,5 @@
+import csv
+import io
 import logging
 import os
 
@@ -13,6 +15,9 @@ load_project_dotenv()
 DEFAULT_SOLRIS_LOOKUP_CSV = resolve_repo_path("data/solris_lookup.csv")
 DEFAULT_WATER_LOOKUP_CSV = resolve_repo_path("data/water_filtration_lookup.csv")
 
+# One pooled engine per connection string, shared by every caller in the process.
+_ENGINES = {}
+
 
 def supabase_engine(required: bool = False):
     supabase_url = os.getenv("SUPABASE_URL")
@@ -21,7 +26,45 @@ def supabase_engine(required: bool = False):
             raise RuntimeError("SUPABASE_URL is not set in .env")
         return None
     conn_str = supabase_url.replace("postgres://", "postgresql://", 1)
-    return create_engine(conn_str)
+    engine = _ENGINES.get(conn_str)
+    if engine is None:
+        engine = create_engine(
+            conn_str,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_timeout=30,
+        )
+        _ENGINES[conn_str] = engine
+    return engine
+
+
+def read_only_connection(engine):
+    """Check out a read-only connection in autocommit mode.
+
+    Skips the BEGIN/ROLLBACK pair the driver otherwise wraps around the reads;
+    the session is marked read-only, so a stray write errors instead of
+    committing.
+    """
+    return engine.connect().execution_options(
+        isolation_level="AUTOCOMMIT", postgresql_readonly=True
+    )
+
+
+def psql_copy(table, conn, keys, data_iter) -> None:
+    """pandas ``to_sql`` insertion method that bulk-loads rows with PostgreSQL COPY."""
+    buf = io.StringIO()
+    csv.writer(buf).writerows(data_iter)
+    buf.seek(0)
+
+    quote = conn.dialect.identifier_preparer.quote_identifier
+    columns = ", ".join(quote(k) for k in keys)
+    table_name = quote(table.name)
+    if table.schema:
+        table_name = f"{quote(table.schema)}.{table_name}"
+    with conn.connection.cursor() as cur:
+        cur.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH CSV", buf)
 
 
 def normalize_water_filtration_df(wf_df: pd.DataFrame) -> pd.DataFrame:
@@ -30,6 +73,11 @@ def normalize_water_filtration_df(wf_df: pd.DataFrame) -> pd.DataFrame:
     )
 
 
+def normalize_solris_df(solris_df: pd.DataFrame) -> pd.DataFrame:
+    """Drop rows without a SOLRIS code and key the rest on an int32 solris_code."""
+    return solris_df.dropna(subset=["solris_code"]).astype({"solris_code": "int32"})
+
+
 def load_lookup_tables(
     prefer_supabase: bool = True,
     require_supabase: bool = False,
@@ -38,9 +86,14 @@ def load_lookup_tables(
         engine = supabase_engine(required=require_supabase)
         if engine is not None:
             try:
-                solris_df = pd.read_sql("SELECT * FROM solris_lookup", engine)
-                wf_df = pd.read_sql("SELECT * FROM water_filtration_lookup", engine)
-                return solris_df, normalize_water_filtration_df(wf_df), "Supabase"
+                with read_only_connection(engine) as conn:
+                    solris_df = pd.read_sql("SELECT * FROM solris_lookup", conn)
+                    wf_df = pd.read_sql("SELECT * FROM water_filtration_lookup", conn)
+                return (
+                    normalize_solris_df(solris_df),
+                    normalize_water_filtration_df(wf_df),
+                    "Supabase",
+                )
             except Exception as exc:
                 if require_supabase:
                     raise
@@ -48,8 +101,6 @@ def load_lookup_tables(
                     "Failed to load lookup tables from Supabase (%s); falling back to local CSV files.",
                     exc,
                 )
-            finally:
-                engine.dispose()
 
     if not DEFAULT_SOLRIS_LOOKUP_CSV.exists():
         raise FileNotFoundError(
@@ -60,7 +111,7 @@ def load_lookup_tables(
             f"Water filtration lookup CSV not found: {DEFAULT_WATER_LOOKUP_CSV}"
         )
 
-    solris_df = pd.read_csv(DEFAULT_SOLRIS_LOOKUP_CSV)
+    solris_df = normalize_solris_df(pd.read_csv(DEFAULT_SOLRIS_LOOKUP_CSV))
     wf_df = normalize_water_filtration_df(pd.read_csv(DEFAULT_WATER_LOOKUP_CSV))
     return solris_df, wf_df, "local CSV files"
 
@@ -95,21 +146,17 @@ def build_lookup_dict(solris_df: pd.DataFrame, wf_df: pd.DataFrame) -> dict:
 
     solris_df["wf_value_per_ha"] = solris_df["wf_value_per_ha"].fillna(0.0)
 
-    def _coerce(val):
-        if pd.isna(val):
-            return 0.0
-        try:
-            return float(val)
-        except (ValueError, TypeError):
-            return val
-
-    lookup = {}
-    for _, row in solris_df.iterrows():
-        code = int(row["solris_code"])
-        lookup[code] = {
-            col: _coerce(row[col]) for col in solris_df.columns if col != "solris_code"
-        }
-    return lookup
+    def _coerce(col: pd.Series) -> pd.Series:
+        # Missing → 0.0; numeric-looking values → float; anything else kept as-is
+        if pd.api.types.is_numeric_dtype(col):
+            return col.astype(float).fillna(0.0)
+        numeric = pd.to_numeric(col, errors="coerce")
+        return numeric.astype(object).where(numeric.notna(), col.astype(object)).fillna(0.0)
+
+    values = solris_df.drop(columns="solris_code").apply(_coerce)
+    values.index = solris_df["solris_code"]
+    values = values[~values.index.duplicated(keep="last")]
+    return values.to_dict("index")
 
 
 def load_lookup_dict(
@@ -109,13 +109,14 @@ def compute_solris_areas(solris_tif: str, geojson: str | None = None) -> dict:
         ds = None
 
     pixel_area_ha = abs(gt[1] * gt[5]) / 10_000.0
+    codes, counts = np.unique(arr, return_counts=True)
     areas = {}
-    for code in np.unique(arr):
+    for code, count in zip(codes, counts):
         if code == 0:
             continue
         if nodata_val is not None and code == int(nodata_val):
             continue
-        areas[int(code)] = int(np.sum(arr == code)) * pixel_area_ha
+        areas[int(code)] = int(count) * pixel_area_ha
     return areas
 
 
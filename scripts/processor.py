@@ -2,9 +2,15 @@ import os
 import pandas as pd
 import logging
 import argparse
+from sqlalchemy import BigInteger
 
 from ecosystem_services import discover_processors
-from lookup_support import load_lookup_tables, supabase_engine
+from lookup_support import (
+    load_lookup_tables,
+    psql_copy,
+    read_only_connection,
+    supabase_engine,
+)
 from runtime_support import ensure_parent_dir, load_project_dotenv, resolve_repo_path
 
 load_project_dotenv()
@@ -55,6 +61,7 @@ def build_combined_results(area_df, solris_df, wf_df, study_area):
         solris_df[["solris_code", "solris_class"]], on="solris_code", how="left"
     )
 
+    es_frames = []
     for ProcessorClass in discover_processors():
         logger.info(f"Running {ProcessorClass.FOLDER_NAME}...")
         proc = ProcessorClass()
@@ -64,11 +71,11 @@ def build_combined_results(area_df, solris_df, wf_df, study_area):
             ProcessorClass.FOLDER_NAME, ProcessorClass.CSV_COLS,
             ProcessorClass.FOLDER_NAME,
         )
-        combined = combined.merge(
-            df[["solris_code"] + ProcessorClass.MERGE_COLS],
-            on="solris_code",
-            how="left",
-        )
+        es_frames.append(df.set_index("solris_code")[ProcessorClass.MERGE_COLS])
+
+    # One join of all ES columns instead of re-merging `combined` per processor
+    if es_frames:
+        combined = combined.join(pd.concat(es_frames, axis=1), on="solris_code")
 
     return combined
 
@@ -88,30 +95,29 @@ def main():
     args = parser.parse_args()
 
     engine = _supabase_engine()
-    try:
-        logger.info("Loading lookup tables from Supabase...")
-        solris_df, wf_df, lookup_source = load_lookup_tables(
-            prefer_supabase=True,
-            require_supabase=True,
-        )
-        logger.info("Loaded lookup tables from %s.", lookup_source)
+    logger.info("Loading lookup tables from Supabase...")
+    solris_df, wf_df, lookup_source = load_lookup_tables(
+        prefer_supabase=True,
+        require_supabase=True,
+    )
+    logger.info("Loaded lookup tables from %s.", lookup_source)
 
-        logger.info(f"Loading area data from Supabase table '{args.source_table}'...")
+    logger.info(f"Loading area data from Supabase table '{args.source_table}'...")
+    source_table = engine.dialect.identifier_preparer.quote_identifier(args.source_table)
+    with read_only_connection(engine) as conn:
         area_df = pd.read_sql(
             f"""
             SELECT solris_code,
                    SUM(area_ha) AS area_hectares
-            FROM "{args.source_table}"
+            FROM {source_table}
             WHERE solris_code IS NOT NULL
               AND solris_code != 0
             GROUP BY solris_code
             ORDER BY solris_code
             """,
-            engine,
-        )
-        logger.info(f"Loaded {len(area_df)} SOLRIS codes.")
-    finally:
-        engine.dispose()
+            conn,
+        ).astype({"solris_code": "int32"})
+    logger.info(f"Loaded {len(area_df)} SOLRIS codes.")
 
     combined = build_combined_results(area_df, solris_df, wf_df, args.study_area)
 
@@ -122,12 +128,17 @@ def main():
     )
 
     # ── Upload to Supabase ─────────────────────────────────────────────────────
-    upload_engine = _supabase_engine()
+    # solris_code is int32 in memory; keep the uploaded column BIGINT as before.
     try:
-        combined.to_sql(table_name, upload_engine, if_exists="replace", index=False)
+        with engine.begin() as conn:
+            combined.to_sql(
+                table_name, conn, if_exists="replace", index=False,
+                dtype={"solris_code": BigInteger()},
+                method=psql_copy, chunksize=50_000,
+            )
         logger.info(f"Uploaded {len(combined)} rows to Supabase table '{table_name}'")
     finally:
-        upload_engine.dispose()
+        engine.dispose()
 
     # ── Export CSV ─────────────────────────────────────────────────────────────
     combined.to_csv(output_csv, index=False)
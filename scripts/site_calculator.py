@@ -102,35 +102,34 @@ def compute_solris_areas(solris_tif: str, geojson: str | None = None) -> dict:
         ds = None
 
     pixel_area_ha = abs(gt[1] * gt[5]) / 10_000.0
+    codes, counts = np.unique(arr, return_counts=True)
     areas = {}
-    for code in np.unique(arr):
+    for code, count in zip(codes, counts):
         if code == 0:
             continue
         if nodata_val is not None and code == int(nodata_val):
             continue
-        areas[int(code)] = int(np.sum(arr == code)) * pixel_area_ha
+        areas[int(code)] = int(count) * pixel_area_ha
     return areas
 
 
 def sample_solris(
     x: float,
     y: float,
-    src_srs: osr.SpatialReference,
-    solris_ds: gdal.Dataset,
-    solris_srs: osr.SpatialReference,
+    transform: osr.CoordinateTransformation | None,
+    band: gdal.Band,
+    gt: tuple,
 ) -> int | None:
-    if not src_srs.IsSame(solris_srs):
-        transform = osr.CoordinateTransformation(src_srs, solris_srs)
+    if transform is not None:
         x, y, _ = transform.TransformPoint(x, y)
 
-    gt = solris_ds.GetGeoTransform()
     px = int((x - gt[0]) / gt[1])
     py = int((y - gt[3]) / gt[5])
 
-    if px < 0 or py < 0 or px >= solris_ds.RasterXSize or py >= solris_ds.RasterYSize:
+    if px < 0 or py < 0 or px >= band.XSize or py >= band.YSize:
         return None
 
-    value = int(solris_ds.GetRasterBand(1).ReadAsArray(px, py, 1, 1)[0][0])
+    value = int(band.ReadAsArray(px, py, 1, 1)[0][0])
     return value if value != 0 else None
 
 
@@ -248,6 +247,15 @@ def main():
         sys.exit("Error: point layer has no spatial reference defined.")
     layer_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
 
+    # Resolve the raster band, geotransform and CRS transform once, not per feature.
+    solris_band = solris_ds.GetRasterBand(1)
+    solris_gt = solris_ds.GetGeoTransform()
+    to_solris = (
+        None
+        if layer_srs.IsSame(solris_srs)
+        else osr.CoordinateTransformation(layer_srs, solris_srs)
+    )
+
     _ensure_field(layer, "solris_code", ogr.OFTInteger)
     for field_name in output_fields:
         _ensure_field(layer, field_name, ogr.OFTReal)
@@ -276,7 +284,7 @@ def main():
             centroid = geom.Centroid()
             x, y = centroid.GetX(), centroid.GetY()
 
-        solris_code = sample_solris(x, y, layer_srs, solris_ds, solris_srs)
+        solris_code = sample_solris(x, y, to_solris, solris_band, solris_gt)
         if solris_code is None:
             layer.SetFeature(feat)
             skipped_unsampled += 1
@@ -327,6 +335,7 @@ def main():
     layer_name = layer.GetName()
     gdb_ds.FlushCache()
     gdb_ds = None
+    solris_band = None
     solris_ds = None
 
     print(